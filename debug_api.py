@@ -5,9 +5,9 @@ Runs on port 5474 and prints messages from connected ESP32 devices
 """
 
 import asyncio
+import time
 import websockets
 import logging
-from datetime import datetime
 
 # Configure logging
 logging.basicConfig(
@@ -22,18 +22,28 @@ connected_clients = set()
 async def handle_client(websocket, path):
     """Handle incoming WebSocket connections"""
     client_addr = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
-    logger.info(f"New client connected: {client_addr}")
+    logger.info("New client connected: %s", client_addr)
     connected_clients.add(websocket)
     
+    # Cache the HH:MM:SS prefix and only format milliseconds per message -
+    # strftime once per second instead of once per log line
+    last_sec = 0
+    last_sec_str = ""
+
     try:
         async for message in websocket:
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            print(f"[{timestamp}] ESP32 ({client_addr}): {message}")
+            now = time.time()
+            sec = int(now)
+            if sec != last_sec:
+                last_sec_str = time.strftime("%H:%M:%S", time.localtime(sec))
+                last_sec = sec
+            ms = int((now - sec) * 1000)
+            print(f"[{last_sec_str}.{ms:03d}] ESP32 ({client_addr}): {message}")
             
     except websockets.exceptions.ConnectionClosed:
-        logger.info(f"Client disconnected: {client_addr}")
+        logger.info("Client disconnected: %s", client_addr)
     except Exception as e:
-        logger.error(f"Error handling client {client_addr}: {e}")
+        logger.error("Error handling client %s: %s", client_addr, e)
     finally:
         connected_clients.discard(websocket)
 
@@ -54,7 +64,7 @@ async def main():
     except KeyboardInterrupt:
         print("\nShutting down server...")
     except Exception as e:
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,5 +1,7 @@
 import os
+import shutil
 import subprocess
+import tempfile
 
 # Define the source directory and target directory on the ESP32
 SOURCE_DIR = "./vario"
@@ -8,9 +10,49 @@ ESP32_TARGET_DIR = ":"
 # Define the serial port for the ESP32
 ESP32_PORT = "COM4"
 
+# Directory names that must never reach the device (set membership
+# instead of substring scans against every path)
+EXCLUDE_DIRS = frozenset({"__pycache__", ".git"})
+
 def upload_files():
     """Upload all files and directories from SOURCE_DIR to the ESP32 root."""
+    # One mpremote invocation for everything - each subprocess call
+    # re-opens the serial port and re-enters the REPL (~200-500ms), which
+    # dominates upload time when done per file. `cp -r` keeps the session
+    # open and recurses into directories itself - which also means it
+    # would happily copy a nested vario/modules/__pycache__ onto flash,
+    # so upload from a staging copy with the excluded names pruned at
+    # every level instead of filtering only the top-level entries.
+    with tempfile.TemporaryDirectory() as staging:
+        stage_root = os.path.join(staging, os.path.basename(os.path.abspath(SOURCE_DIR)))
+        shutil.copytree(SOURCE_DIR, stage_root,
+                        ignore=shutil.ignore_patterns(*EXCLUDE_DIRS))
+        sources = [os.path.join(stage_root, entry)
+                   for entry in sorted(os.listdir(stage_root))]
+        if not sources:
+            print(f"Nothing to upload in {SOURCE_DIR}")
+            return
+
+        print(f"Uploading {len(sources)} entries from {SOURCE_DIR} to {ESP32_TARGET_DIR}")
+        try:
+            subprocess.run(
+                ["mpremote", "connect", ESP32_PORT, "fs", "cp", "-r"] + sources + [ESP32_TARGET_DIR],
+                check=True,
+            )
+            return
+        except subprocess.CalledProcessError as e:
+            print(f"Batched upload failed ({e}), falling back to per-file copy")
+
+    # Fallback for mpremote versions without recursive cp
+    upload_files_individually()
+
+
+def upload_files_individually():
+    """Per-file upload fallback - slow, but works on any mpremote."""
     for root, dirs, files in os.walk(SOURCE_DIR):
+        # Prune excluded directories in place so os.walk never descends
+        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+
         # Calculate the relative path from SOURCE_DIR
         relative_path = os.path.relpath(root, SOURCE_DIR)
         target_path = ESP32_TARGET_DIR if relative_path == "." else f"{ESP32_TARGET_DIR}/{relative_path}"
@@ -39,4 +81,4 @@ def upload_files():
                 print(f"Failed to upload {src_file}: {e}")
 
 if __name__ == "__main__":
-    upload_files()
\ No newline at end of file
+    upload_files()
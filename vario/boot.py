@@ -19,6 +19,7 @@ from modules.boot_config import (
 from modules.network_manager import NetworkManager
 from modules.hardware_manager import HardwareManager
 from modules.variostate import VarioState
+from modules import util
 
 # Import system configuration
 from config import (
@@ -46,31 +47,47 @@ def initialize_vario_state():
     return vario_state
 
 
-def setup_networking(vario_state):
+def start_wifi_association():
     """
-    Step 2: Setup WiFi and WebSocket (if remote debugging enabled)
-    Returns: (success, network_manager)
+    Step 2a: Kick off WiFi association without waiting for link-up
+    The radio negotiates in the background while sensors initialize
+    Returns: network_manager (or None when remote debugging is off)
     """
     if not ENABLE_REMOTE_DEBUG:
-        print("📡 STEP 2: Remote debugging disabled - running standalone")
-        vario_state.websocket_enabled = False
-        vario_state.log("ESP32 Vario booted in standalone mode")
-        return True, None
-    
-    print("📡 STEP 2: Setting up remote debugging...")
-    
+        return None
+
+    print("📡 STEP 2a: Starting WiFi association (non-blocking)...")
+
     network_mgr = NetworkManager(
         wifi_ssid=WIFI_SSID,
         wifi_password=WIFI_PASSWORD,
         websocket_host=WEBSOCKET_HOST,
         websocket_port=WEBSOCKET_PORT
     )
-    
+    network_mgr.begin_wifi_connect()
+    return network_mgr
+
+
+def setup_networking(vario_state, network_mgr):
+    """
+    Step 2b: Wait for WiFi and set up the WebSocket (if remote debugging enabled)
+    Returns: (success, network_manager)
+    """
+    if not ENABLE_REMOTE_DEBUG:
+        print("📡 STEP 2b: Remote debugging disabled - running standalone")
+        vario_state.websocket_enabled = False
+        vario_state.log("ESP32 Vario booted in standalone mode")
+        return True, None
+
+    print("📡 STEP 2b: Setting up remote debugging...")
+
     websocket_sock, wlan = network_mgr.setup_websocket()
     
     if websocket_sock:
         vario_state.websocket_sock = websocket_sock
         vario_state.websocket_enabled = True
+        vario_state.start_log_drain()  # Ship logs from a background thread
+        util.bind_ws(websocket_sock)  # Wire up the util.send_to_websocket shim
         vario_state.log("ESP32 Vario booted with remote debugging")
         vario_state.log(f"Network IP: {wlan.ifconfig()[0]}")
         print("✓ Remote debugging active")
@@ -149,13 +166,17 @@ def main_boot_sequence():
     try:
         # Step 1: Core system state
         vario_state = initialize_vario_state()
-        
-        # Step 2: Networking (optional)
-        network_success, network_mgr = setup_networking(vario_state)
-        
-        # Step 3: Hardware (critical)
+
+        # Step 2a: Start WiFi association early - the 1-3s the radio
+        # needs to join the network overlaps with sensor initialization
+        network_mgr = start_wifi_association()
+
+        # Step 3: Hardware (critical) - runs while WiFi associates
         hardware_success, hardware_info = setup_hardware(vario_state)
-        
+
+        # Step 2b: Wait for the link and do the WebSocket handshake
+        network_success, network_mgr = setup_networking(vario_state, network_mgr)
+
         if not hardware_success:
             print("🚨 BOOT FAILED: Critical hardware not available")
             return False
@@ -163,8 +184,11 @@ def main_boot_sequence():
         # Step 4: Make everything available to main.py
         store_in_global_state(vario_state, hardware_info, network_mgr)
         
-        # Final cleanup
+        # Final cleanup, then let allocation pressure drive collection:
+        # collect when a quarter of the currently free heap has been
+        # allocated, instead of forcing a collect on a timer in the loop
         gc.collect()
+        gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
         
         print("🎉 BOOT SUCCESS: System ready for operation!")
         return True
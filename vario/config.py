@@ -1,16 +1,30 @@
 # Config
 
+from micropython import const
+
 # Measurement configuration
-MEASUREMENT_FREQUENCY = 50
+# const() lets the compiler inline these as immediate operands instead of
+# global lookups in the 50 Hz loop
+MEASUREMENT_FREQUENCY = const(50)
 MEASUREMENT_INTERVAL = 1 / MEASUREMENT_FREQUENCY # seconds
-INTERVAL_MS = int(MEASUREMENT_INTERVAL * 1000)  # Convert to milliseconds
+INTERVAL_MS = const(1000 // MEASUREMENT_FREQUENCY)  # Convert to milliseconds
 BASE_PRESSURE = 1013.25  # hPa, sea level standard atmospheric pressure
 
 # Filter and integration settings
 MINIMAL_DELAY = 0.1  # seconds
 INTEGRATION_INTERVAL = 12.0  # seconds for integrated vertical speed
 
+# Use the 2-state Kalman filter (modules/kalman.py) for v_speed instead
+# of the weighted finite differences in calc_v_speed. Off by default
+# until the tuning has been compared against the classic filter in the air
+USE_KALMAN_FILTER = False
+
+# Precomputed lookback offsets for get_v_speed (samples back from newest)
+SHORT_IDX = int(MINIMAL_DELAY * MEASUREMENT_FREQUENCY)  # 0.1s window
+MID_IDX = const(MEASUREMENT_FREQUENCY // 2)             # 0.5s window
+LONG_IDX = const(2 * MEASUREMENT_FREQUENCY)             # 2.0s window
+
 # Audio configuration
 POSTIVE_BEEP_THRESHOLD = 0.1
 NEGATIVE_BEEP_THRESHOLD = -1
-BUZZER_PIN = 4
\ No newline at end of file
+BUZZER_PIN = const(4)
@@ -1,22 +1,29 @@
-import time
-import gc
+import machine
+# Bound at import so the tick path does LOAD_GLOBAL instead of the
+# module attribute lookup time.ticks_ms does on every call
+from time import ticks_ms, ticks_diff
 from _thread import allocate_lock
 
 from modules.calc_v_speed import get_v_speed
+from modules.kalman import KalmanVSpeed
 from modules.util import convert_to_altitude
-from modules.frontend import display_v_speed
+from modules.frontend import display_vario
 import modules.global_state as global_state
 
 # Import config variables
 from config import (
     MEASUREMENT_FREQUENCY,
-    MINIMAL_DELAY,
     INTEGRATION_INTERVAL,
     POSTIVE_BEEP_THRESHOLD,
-    NEGATIVE_BEEP_THRESHOLD,    
-    INTERVAL_MS
+    NEGATIVE_BEEP_THRESHOLD,
+    INTERVAL_MS,
+    USE_KALMAN_FILTER
 )
 
+# Converts a centimeter altitude difference over the integration window
+# into m/s - precomputed so the tick path does one multiply, no divides
+_INTEGRATED_SCALE = 0.01 / INTEGRATION_INTERVAL
+
 def main():
     """
     Main vario application - reads sensors and calculates vertical speed
@@ -45,6 +52,11 @@ def main():
     vario_state.log(f"BMI160 Sensor: {'✓ Ready' if (bmi160_sensor and bmi160_sensor.is_initialized) else '✗ Not Available'}")
     vario_state.log(f"Audio System: {'✓ Ready' if (audio_system and audio_system.is_initialized) else '✗ Not Available'}")
     
+    # Optional Kalman filter for v_speed (see USE_KALMAN_FILTER in config)
+    if USE_KALMAN_FILTER:
+        vario_state.kalman_filter = KalmanVSpeed(1.0 / MEASUREMENT_FREQUENCY)
+        vario_state.log("v_speed filter: Kalman (2-state)")
+
     # Start audio feedback if available
     v_speed_lock = allocate_lock()
     if audio_system and audio_system.is_initialized:
@@ -64,65 +76,113 @@ def run_vario_loop(vario_state, ms5611_sensor, bmi160_sensor, v_speed_lock):
     Runs continuously at MEASUREMENT_FREQUENCY Hz
     Reads barometric pressure and calculates vertical speed
     """
-    vario_state.last_measurement_time = time.ticks_ms()
+    vario_state.last_measurement_time = ticks_ms()
     vario_state.log(f"Starting vario loop at {MEASUREMENT_FREQUENCY} Hz")
-    
+
+    # Hardware timer wakes the loop at MEASUREMENT_FREQUENCY instead of
+    # polling every millisecond - the lock acts as a binary semaphore
+    # released from the timer IRQ, so the CPU sleeps between ticks
+    # Kick off the first conversion so the first cycle has data to read
+    ms5611_sensor.start_pressure_conversion()
+
+    tick_event = allocate_lock()
+    tick_event.acquire()
+
+    def on_timer_tick(timer):
+        # Release at most once; if the loop is still busy, the next
+        # acquire returns immediately and catches up
+        if tick_event.locked():
+            tick_event.release()
+
+    timer = machine.Timer(0)
+    timer.init(freq=MEASUREMENT_FREQUENCY, mode=machine.Timer.PERIODIC,
+               callback=on_timer_tick)
+
     while True:
+        tick_event.acquire()  # Blocks until the timer fires
         if vario_state.turned_on:
             measure_and_calculate(vario_state, ms5611_sensor, bmi160_sensor, v_speed_lock)
-        time.sleep_ms(1)  # Small delay to prevent CPU overload
 
 
 def measure_and_calculate(vario_state, ms5611_sensor, bmi160_sensor, v_speed_lock):
     """
     Single measurement cycle: read sensors, calculate altitude and vertical speed
     """
-    current_time = time.ticks_ms()
+    current_time = ticks_ms()
     
     # Check if it's time for next measurement
-    if time.ticks_diff(current_time, vario_state.last_measurement_time) < INTERVAL_MS:
+    if ticks_diff(current_time, vario_state.last_measurement_time) < INTERVAL_MS:
         return  # Not time yet
     
     try:
-        # Read barometric pressure
-        pressure = ms5611_sensor.read_pressure()
+        # Read the pressure converted during the idle time since last tick
+        pressure = ms5611_sensor.read_pressure_pipelined()
         altitude = convert_to_altitude(pressure, vario_state.estimated_local_pressure)
-        
-        # Update altitude history (sliding window)
-        vario_state.altitude_log.append(altitude)
-        vario_state.altitude_log.pop(0)
-        
+        altitude_cm = int(altitude * 100)  # Ring buffer stores int centimeters
+
+        # Median-of-3 glitch filter: a single baro outlier would land in
+        # the newest ring slot and turn into a nonphysical v_speed spike
+        # that the low-pass cannot absorb in one step
+        p1 = vario_state.prev_raw_altitude
+        p2 = vario_state.prev_raw_altitude2
+        vario_state.prev_raw_altitude2 = p1
+        vario_state.prev_raw_altitude = altitude_cm
+        if p2 is not None:
+            altitude_cm = (altitude_cm + p1 + p2
+                           - max(altitude_cm, p1, p2) - min(altitude_cm, p1, p2))
+            altitude = altitude_cm * 0.01
+
+        # Update altitude history (ring buffer - overwrite the oldest sample)
+        altitude_log = vario_state.altitude_log
+        write_index = vario_state.push_altitude(altitude_cm)
+
         # Calculate vertical speed (thread-safe)
+        # Hot values are kept in locals (LOAD_FAST) and written back once
+        # instead of re-reading vario_state attributes throughout the cycle
+        last_v_speed = vario_state.last_v_speed
+        kalman_filter = vario_state.kalman_filter
         with v_speed_lock:
-            vario_state.v_speed = round(
-                get_v_speed(vario_state.altitude_log, vario_state.last_v_speed, 
-                           MEASUREMENT_FREQUENCY, MINIMAL_DELAY), 2
-            )
-        
+            if kalman_filter is not None:
+                v_speed = round(kalman_filter.update(altitude), 2)
+            else:
+                v_speed = round(get_v_speed(altitude_log, write_index, last_v_speed), 2)
+            vario_state.v_speed = v_speed
+
         # Calculate integrated vertical speed (smoothed over longer time)
-        vario_state.integrated_v_speed = round(
-            (altitude - vario_state.altitude_log[0]) / INTEGRATION_INTERVAL, 2
+        # After advancing, write_index points at the oldest sample
+        integrated_v_speed = round(
+            (altitude_cm - altitude_log[write_index]) * _INTEGRATED_SCALE, 2
         )
-        
-        # Display updates (only when values change)
-        if vario_state.v_speed != vario_state.last_v_speed:
-            display_v_speed(vario_state.v_speed, vario_state)
-        
+        vario_state.integrated_v_speed = integrated_v_speed
+
+        # Display updates (only when values change, at most 10 Hz - faster
+        # is unreadable anyway and each update blocks on the UART)
+        if (v_speed != last_v_speed
+                and ticks_diff(current_time, vario_state.last_display_time) >= 100):
+            display_vario(v_speed, integrated_v_speed, vario_state)
+            vario_state.last_display_time = current_time
+
         # Update state for next cycle
-        vario_state.last_v_speed = vario_state.v_speed
-        vario_state.last_integrated_v_speed = vario_state.integrated_v_speed
+        vario_state.last_v_speed = v_speed
+        vario_state.last_integrated_v_speed = integrated_v_speed
         vario_state.last_measurement_time += INTERVAL_MS
         vario_state.measurement_count += 1
-        
-        # Periodic garbage collection (every 2 seconds)
-        if vario_state.measurement_count % (2 * MEASUREMENT_FREQUENCY) == 0:
-            gc.collect()
-            vario_state.measurement_count = 0
-            
+
+        # No forced gc.collect() here - the tick path no longer allocates
+        # beyond a few floats, and boot.py sets gc.threshold() so
+        # collection triggers on allocation pressure, not wallclock
+
+        # Start the next conversion so the ADC works while we idle
+        ms5611_sensor.start_pressure_conversion()
+
     except Exception as e:
         vario_state.log(f"Measurement error: {e}")
         # Keep timing even if measurement fails
         vario_state.last_measurement_time += INTERVAL_MS
+        try:
+            ms5611_sensor.start_pressure_conversion()
+        except Exception:
+            pass  # Sensor unreachable - the next cycle will log again
 
 
 # Start the application
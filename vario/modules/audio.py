@@ -1,10 +1,25 @@
-from time import sleep
+from time import sleep_ms
 from machine import Pin, PWM
 from _thread import start_new_thread
 
 class AudioSystem:
     """Class-based audio system for ESP32 Vario buzzer management"""
-    
+
+    # v_speed -> tone mapping as a sorted cut-point table: _TONE_TABLE[i]
+    # applies between _TONE_THRESHOLDS[i-1] and _TONE_THRESHOLDS[i].
+    # Class-level constants so no tuples are built per lookup
+    _TONE_THRESHOLDS = (-2.0, -1.0, -0.5, 0.1, 0.5, 1.0, 1.5)
+    _TONE_TABLE = (
+        (300, 500, 0),     # v < -2.0: strong sink - continuous low tone
+        (400, 400, 50),
+        (500, 300, 100),
+        (0, 0, 200),       # Neutral zone - silence
+        (1200, 200, 300),  # Weak lift
+        (1400, 150, 150),
+        (1600, 120, 80),
+        (1800, 100, 50),   # v > 1.5: fast beep, high pitch for strong lift
+    )
+
     def __init__(self, buzzer_pin=4):
         """Initialize AudioSystem with specified buzzer pin"""
         self.buzzer_pin = buzzer_pin
@@ -37,13 +52,13 @@ class AudioSystem:
             # Set frequency and start tone (50% duty cycle for good volume)
             self.buzzer_pwm.freq(int(frequency))
             self.buzzer_pwm.duty(512)  # 50% duty cycle (0-1023 range)
-            sleep(duration / 1000.0)   # Convert ms to seconds
+            sleep_ms(duration)         # Durations are already in ms
             self.buzzer_pwm.duty(0)    # Stop tone
         else:
             # Silence - ensure buzzer is off
             self.buzzer_pwm.duty(0)
             if duration > 0:
-                sleep(duration / 1000.0)
+                sleep_ms(duration)
     
     def stop_all_sounds(self):
         """Immediately stop all audio output"""
@@ -71,7 +86,7 @@ class AudioSystem:
         while True:
             # Check if vario is turned on
             if not vario_state.turned_on:
-                sleep(0.1)
+                sleep_ms(100)
                 continue
             
             # Thread-safe v_speed reading
@@ -94,30 +109,27 @@ class AudioSystem:
                 if v_speed > positive_threshold or v_speed < negative_threshold:
                     self.play_tone(tone, duration)
                     if pause > 0:
-                        sleep(pause / 1000.0)
+                        sleep_ms(pause)
             else:
                 vario_state.onboard_led.value(0)  # LED off when sound disabled
-                sleep(0.1)  # Prevent busy waiting
+                sleep_ms(100)  # Prevent busy waiting
     
     def _map_vspeed_to_tone(self, v_speed):
         """Map vertical speed to audio parameters (frequency_hz, duration_ms, pause_ms)"""
-        if v_speed > 1.5:
-            return (1800, 100, 50)    # Fast beep, high pitch for strong lift
-        elif v_speed > 1.0:
-            return (1600, 120, 80)
-        elif v_speed > 0.5:
-            return (1400, 150, 150)
-        elif v_speed > 0.1:           # Weak lift
-            return (1200, 200, 300)
-        elif v_speed < -2.0:          # Strong sink - continuous low tone
-            return (300, 500, 0)      # No pause = continuous
-        elif v_speed < -1.0:
-            return (400, 400, 50)
-        elif v_speed < -0.5:
-            return (500, 300, 100)
-        else:
-            return (0, 0, 200)        # Silence in neutral zone
-    
+        # Binary search over the sorted cut-points (3 comparisons instead
+        # of up to 8 in the old if/elif ladder; no bisect module in
+        # MicroPython, so it is inlined)
+        thresholds = self._TONE_THRESHOLDS
+        lo = 0
+        hi = len(thresholds)
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if v_speed < thresholds[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        return self._TONE_TABLE[lo]
+
     def get_info(self):
         """Get audio system information for debugging"""
         return {
@@ -15,6 +15,12 @@ WIFI_PASSWORD = "N0Fr33Wifi!"
 WEBSOCKET_HOST = "192.168.178.119"  # Replace with your PC's IP address
 WEBSOCKET_PORT = 5474
 
+# Use an all-zero masking key for outgoing WebSocket frames. RFC 6455
+# allows any key, and with a zero key the masking XOR is the identity,
+# so the payload is copied instead of transformed - the debug logs are
+# plaintext on the LAN either way. Set to False for strict servers.
+FAST_WS_MASK = True
+
 # Boot Messages
 BOOT_MESSAGES = {
     'remote_debug': "ESP32 Vario Boot Sequence (Remote Debug Mode)",
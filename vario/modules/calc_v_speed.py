@@ -1,5 +1,20 @@
-def get_v_speed(altitude_log, last_v_speed=0.0, 
-                MEASUREMENT_FREQUENCY=50, MINIMAL_DELAY=0.1):
+import micropython
+
+from config import SHORT_IDX, MID_IDX, LONG_IDX, MINIMAL_DELAY
+
+# Filter coefficients folded into one multiplier per altitude difference:
+# (weight / 6) / interval, scaled by the low-pass alpha - precomputed at
+# import so the hot path is four multiplies and three adds. The extra
+# 0.01 converts the integer-centimeter buffer differences to m/s
+_ALPHA = 0.7
+_SHORT_COEF = _ALPHA * (3 / 6) / MINIMAL_DELAY * 0.01
+_MID_COEF = _ALPHA * (2 / 6) / 0.5 * 0.01
+_LONG_COEF = _ALPHA * (1 / 6) / 2.0 * 0.01
+_LAST_COEF = 1 - _ALPHA
+
+
+@micropython.native
+def get_v_speed(altitude_log, write_index, last_v_speed=0.0):
     """
     Calculate the vertical speed based on altitude changes over time.
     - uses different filters to smooth out readings
@@ -11,7 +26,10 @@ def get_v_speed(altitude_log, last_v_speed=0.0,
     - combines data from multiple sensors (if available, later on)
 
     Args:
-        altitude_log (list): A list of recent altitude readings.
+        altitude_log (array): Ring buffer of recent altitude readings
+                              in integer centimeters.
+        write_index (int): Next write position in the ring buffer
+                           (write_index - 1 is the newest sample).
     Returns:
         float: The vertical speed in m/s.
 
@@ -21,29 +39,17 @@ def get_v_speed(altitude_log, last_v_speed=0.0,
     - implement a more sophisticated filtering algorithm (e.g., Kalman filter) for better accuracy
     """
 
-    if len(altitude_log) < 2:
+    n = len(altitude_log)
+    if n < 2:
         return 0.0  # Not enough data to calculate vertical speed
+
+    # Calculate altitude differences (ring buffer: newest is write_index - 1)
+    # Lookback offsets are precomputed once in config.py, not per call
+    newest = altitude_log[(write_index - 1) % n]
+    short_term_diff = newest - altitude_log[(write_index - SHORT_IDX) % n]
+    mid_term_diff = newest - altitude_log[(write_index - MID_IDX) % n]
+    long_term_diff = newest - altitude_log[(write_index - LONG_IDX) % n]
     
-    # Indices for different time intervals
-    short_idx = -int(MINIMAL_DELAY * MEASUREMENT_FREQUENCY)  # -5 (0.1s * 50Hz)
-    mid_idx = -int(MEASUREMENT_FREQUENCY * 0.5)              # -25 (0.5s * 50Hz)  
-    long_idx = -int(2 * MEASUREMENT_FREQUENCY)               # -100 (2.0s * 50Hz)
-    
-    # Calculate altitude differences
-    short_term_diff = altitude_log[-1] - altitude_log[short_idx]
-    mid_term_diff = altitude_log[-1] - altitude_log[mid_idx]  
-    long_term_diff = altitude_log[-1] - altitude_log[long_idx]
-    
-    # Convert to velocities (divide by time intervals)
-    short_v = short_term_diff / MINIMAL_DELAY      # m/s over 0.1s
-    mid_v = mid_term_diff / 0.5                    # m/s over 0.5s
-    long_v = long_term_diff / 2.0                  # m/s over 2.0s
-    
-    # Weighted average
-    v_speed = (3 * short_v + 2 * mid_v + 1 * long_v) / 6
-    
-    # Low-pass filter
-    alpha = 0.7
-    v_speed = alpha * v_speed + (1 - alpha) * last_v_speed
-    
-    return v_speed
+    # Weighted multi-interval average + low-pass filter in one expression
+    return (_SHORT_COEF * short_term_diff + _MID_COEF * mid_term_diff
+            + _LONG_COEF * long_term_diff + _LAST_COEF * last_v_speed)
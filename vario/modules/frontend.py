@@ -1,3 +1,10 @@
+def display_vario(v_speed, integrated_v_speed, vario_state):
+    """
+    Display vertical speed and integrated vertical speed in one line -
+    a single log call (one f-string, one WebSocket frame) instead of two
+    """
+    vario_state.log(f"Vertical Speed: {v_speed:.2f} m/s | Integrated: {integrated_v_speed:.2f} m/s")
+
 def display_v_speed(v_speed, vario_state):
     """
     Display the current vertical speed
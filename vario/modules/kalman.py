@@ -0,0 +1,77 @@
+import micropython
+
+
+class KalmanVSpeed:
+    """
+    Two-state (altitude, vertical speed) Kalman filter over barometric
+    altitude samples - the "more sophisticated filtering algorithm"
+    from the get_v_speed todo list.
+
+    Constant-velocity model with white-noise acceleration as process
+    noise; the baro altitude is the only measurement (H = [1, 0]).
+    Fusing the BMI160 vertical acceleration as a control input is the
+    natural extension once the IMU is calibrated for orientation.
+
+    All state lives in plain float attributes and update() allocates
+    nothing, so it is safe on the 50 Hz measurement path.
+    """
+
+    def __init__(self, dt, process_noise=0.5, measurement_noise=0.6):
+        """
+        Args:
+            dt (float): Sample interval in seconds (1/MEASUREMENT_FREQUENCY).
+            process_noise (float): Acceleration noise density (m/s^2)^2 -
+                                   higher tracks maneuvers faster, noisier.
+            measurement_noise (float): Baro altitude variance (m^2).
+        """
+        self.altitude = 0.0
+        self.v_speed = 0.0
+        self.dt = dt
+        self.r = measurement_noise
+        # Process-noise contributions folded to per-step constants
+        # (white-noise acceleration: Q = q * [[dt^4/4, dt^3/2], [dt^3/2, dt^2]])
+        dt2 = dt * dt
+        self._q00 = 0.25 * dt2 * dt2 * process_noise
+        self._q01 = 0.5 * dt2 * dt * process_noise
+        self._q11 = dt2 * process_noise
+        # Covariance starts large so the first samples dominate the state
+        self.p00 = 100.0
+        self.p01 = 0.0
+        self.p10 = 0.0
+        self.p11 = 100.0
+        self.initialized = False
+
+    @micropython.native
+    def update(self, measured_altitude):
+        """
+        Advance one step and fold in a baro altitude sample.
+        Returns:
+            float: The filtered vertical speed in m/s.
+        """
+        if not self.initialized:
+            self.altitude = measured_altitude
+            self.initialized = True
+            return 0.0
+
+        dt = self.dt
+
+        # Predict (constant-velocity model, matrices expanded by hand -
+        # MicroPython has no numpy and 2x2 needs none)
+        self.altitude += self.v_speed * dt
+        p00 = self.p00 + dt * (self.p01 + self.p10) + dt * dt * self.p11 + self._q00
+        p01 = self.p01 + dt * self.p11 + self._q01
+        p10 = self.p10 + dt * self.p11 + self._q01
+        p11 = self.p11 + self._q11
+
+        # Update with the measurement
+        innovation = measured_altitude - self.altitude
+        s_inv = 1.0 / (p00 + self.r)
+        k0 = p00 * s_inv
+        k1 = p10 * s_inv
+        self.altitude += k0 * innovation
+        self.v_speed += k1 * innovation
+        self.p00 = p00 - k0 * p00
+        self.p01 = p01 - k0 * p01
+        self.p10 = p10 - k1 * p00
+        self.p11 = p11 - k1 * p01
+        return self.v_speed
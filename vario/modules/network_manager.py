@@ -1,7 +1,9 @@
 # network_manager.py - WiFi and WebSocket connection management
 
 import network
+import os
 import socket
+import struct
 import time
 import ubinascii
 import urandom
@@ -16,25 +18,57 @@ class NetworkManager:
         self.websocket_port = websocket_port
         self.wlan = None
         self.websocket_sock = None
+
+        # Host and port are fixed for the manager's lifetime, so the
+        # static part of the handshake request is encoded once here
+        # instead of f-string-formatting the whole header per connect
+        self._handshake_prefix = (
+            f"GET / HTTP/1.1\r\n"
+            f"Host: {websocket_host}:{websocket_port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            "Sec-WebSocket-Key: "
+        ).encode()
+        self._handshake_suffix = b"\r\nSec-WebSocket-Version: 13\r\n\r\n"
     
+    def begin_wifi_connect(self):
+        """Start WiFi association without blocking - the radio negotiates
+        in the background while the caller does other boot work; call
+        connect_wifi() afterwards to wait for link-up"""
+        if self.wlan is None:
+            self.wlan = network.WLAN(network.STA_IF)
+            self.wlan.active(True)
+            try:
+                # Disable WiFi power save - association completes faster
+                # and the debug link stops dropping into doze latency
+                self.wlan.config(pm=network.WLAN.PM_NONE)
+            except (AttributeError, ValueError, OSError):
+                pass  # Older ports don't expose the power-save knob
+            if not self.wlan.isconnected():
+                print(f"Connecting to WiFi: {self.wifi_ssid}")
+                self.wlan.connect(self.wifi_ssid, self.wifi_password)
+        return self.wlan
+
     def connect_wifi(self):
         """Connect to WiFi network with timeout and status reporting"""
-        self.wlan = network.WLAN(network.STA_IF)
-        self.wlan.active(True)
-        
+        # Starts association if begin_wifi_connect wasn't called earlier
+        self.begin_wifi_connect()
+
         if self.wlan.isconnected():
-            print("Already connected to WiFi")
+            print("WiFi connected")
+            config = self.wlan.ifconfig()
+            print(f"IP: {config[0]}")
             return self.wlan
-        
-        print(f"Connecting to WiFi: {self.wifi_ssid}")
-        self.wlan.connect(self.wifi_ssid, self.wifi_password)
-        
-        # Wait for connection with timeout
-        timeout = 0
-        while not self.wlan.isconnected() and timeout < 20:
-            print(".", end="")
-            time.sleep(1)
-            timeout += 1
+
+        # Wait for connection with timeout - poll every 100ms so link-up is
+        # noticed almost immediately instead of up to a second late
+        # (MicroPython's WLAN has no connect event to block on)
+        waited_ms = 0
+        while not self.wlan.isconnected() and waited_ms < 20000:
+            time.sleep_ms(100)
+            waited_ms += 100
+            if waited_ms % 1000 == 0:
+                print(".", end="")
         
         if self.wlan.isconnected():
             config = self.wlan.ifconfig()
@@ -50,31 +84,37 @@ class NetworkManager:
     
     def _create_websocket_key(self):
         """Generate a random WebSocket key for handshake"""
-        key = ubinascii.b2a_base64(bytes([urandom.getrandbits(8) for _ in range(16)])).decode().strip()
-        return key
-    
-    def _websocket_handshake(self, sock, path="/"):
+        try:
+            # One call instead of 16 separate PRNG round-trips
+            random_bytes = os.urandom(16)
+        except AttributeError:
+            # Some MicroPython builds lack os.urandom
+            random_bytes = struct.pack('>IIII',
+                                       urandom.getrandbits(32), urandom.getrandbits(32),
+                                       urandom.getrandbits(32), urandom.getrandbits(32))
+        return ubinascii.b2a_base64(random_bytes).strip()
+
+    def _websocket_handshake(self, sock):
         """Perform WebSocket handshake with the server"""
         key = self._create_websocket_key()
+
+        # Splice the per-connection key between the pre-encoded template
+        # halves - no str formatting or encode pass at connect time
+        sock.send(self._handshake_prefix + key + self._handshake_suffix)
         
-        # Create handshake request
-        request = (
-            f"GET {path} HTTP/1.1\r\n"
-            f"Host: {self.websocket_host}:{self.websocket_port}\r\n"
-            "Upgrade: websocket\r\n"
-            "Connection: Upgrade\r\n"
-            f"Sec-WebSocket-Key: {key}\r\n"
-            "Sec-WebSocket-Version: 13\r\n"
-            "\r\n"
-        )
-        
-        # Send handshake
-        sock.send(request.encode())
-        
-        # Read response
-        response = sock.recv(1024).decode()
-        
-        if "101 Switching Protocols" in response and "Upgrade: websocket" in response:
+        # Read until the end of the HTTP headers and check them as raw
+        # bytes - a C-level find instead of decoding to str, and robust
+        # against the response spanning multiple TCP segments
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = sock.recv(512)
+            if not chunk:
+                break  # Server closed before finishing the handshake
+            response += chunk
+            if len(response) > 4096:
+                break  # Malformed response - never this large for a 101
+
+        if b"101 Switching Protocols" in response and b"Upgrade: websocket" in response:
             print("WebSocket handshake successful!")
             return True
         else:
@@ -94,6 +134,15 @@ class NetworkManager:
             # Create socket connection
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(10)  # 10 second timeout
+
+            # Disable Nagle so small 50 Hz log frames ship immediately, and
+            # enable keepalive to detect a dead Wi-Fi link promptly
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            except (AttributeError, OSError):
+                pass  # Not every MicroPython port exposes these options
+
             sock.connect((self.websocket_host, self.websocket_port))
             
             # Perform WebSocket handshake
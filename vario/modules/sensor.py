@@ -1,27 +1,96 @@
-import machine, time
+import machine, micropython, time
+
+# Preallocated MS5611 command bytes - avoids a bytearray allocation per write
+_CMD_RESET = b'\x1e'
+
+# Conversion commands and typical conversion time (ms, rounded up) per
+# oversampling ratio: (D1 pressure cmd, D2 temperature cmd, conv ms).
+# Higher OSR = less ADC noise but longer conversion (datasheet table 3)
+_OSR_TABLE = {
+    256:  (b'\x40', b'\x50', 1),
+    512:  (b'\x42', b'\x52', 2),
+    1024: (b'\x44', b'\x54', 3),
+    2048: (b'\x46', b'\x56', 5),
+    4096: (b'\x48', b'\x58', 10),
+}
+
+
+@micropython.native
+def _s16(lo, hi):
+    """Combine two bytes into a signed 16-bit value without allocating"""
+    value = (hi << 8) | lo
+    return value - 65536 if value & 0x8000 else value
+
+
+@micropython.native
+def _compensate_pressure(d1, d2, c1_shifted, c2_shifted, c3, c4, c5_shifted):
+    """MS5611 first-order pressure compensation (datasheet formulas).
+
+    Takes c1<<15, c2<<16 and c5<<8 precomputed at calibration time and
+    uses shifts for the remaining power-of-two factors.
+    """
+    dT = d2 - c5_shifted
+    off = c2_shifted + ((c4 * dT) >> 7)
+    sens = c1_shifted + ((c3 * dT) >> 8)
+    return (((d1 * sens) >> 21) - off) >> 15
+
 
 class MS5611Sensor:
     """MS5611 Barometric Pressure Sensor Driver (I2C Mode)"""
     
-    def __init__(self, scl_pin=22, sda_pin=21, i2c_address=0x76):
-        """Initialize MS5611 sensor with configurable I2C pins and address"""
+    def __init__(self, scl_pin=22, sda_pin=21, i2c_address=0x76, i2c_freq=400000,
+                 osr=1024):
+        """Initialize MS5611 sensor with configurable I2C pins, address,
+        bus frequency and oversampling ratio
+
+        400kHz is the MS5611's I2C fast-mode maximum per datasheet (the
+        higher clock figures apply to its SPI interface only), so that
+        stays the default; overclocking is opt-in per deployment.
+
+        osr trades noise against conversion time (256..4096, see
+        _OSR_TABLE). 1024 converts in ~2.3ms, which comfortably fits the
+        idle window of a 50 Hz measurement loop; 4096 roughly halves the
+        pressure noise but needs ~9ms per conversion.
+        """
+        if osr not in _OSR_TABLE:
+            raise ValueError(f"Invalid OSR {osr} (must be one of {sorted(_OSR_TABLE)})")
         self.scl_pin = scl_pin
         self.sda_pin = sda_pin
         self.i2c_address = i2c_address
+        self.i2c_freq = i2c_freq
+        self.osr = osr
+        self._cmd_conv_pressure, self._cmd_conv_temp, self._conv_ms = _OSR_TABLE[osr]
         
         # Hardware references
         self.i2c = None
         self.calibration = None
         self.is_initialized = False
-    
+
+        # Pipelined conversion state (see read_pressure_pipelined)
+        self._last_d2 = 0   # Cached temperature ADC value
+        self._d2_age = 0    # Cycles since the temperature was refreshed
+
+        # Preallocated receive buffers - zero-allocation reads at 50 Hz
+        self._rx2 = bytearray(2)
+        self._rx3 = bytearray(3)
+
     def _init_i2c(self):
         """Initialize I2C communication with MS5611 sensor"""
         # Configure I2C bus with specific settings for MS5611
-        self.i2c = machine.I2C(0,
-                              scl=machine.Pin(self.scl_pin),
-                              sda=machine.Pin(self.sda_pin),
-                              freq=400000)  # 400kHz I2C frequency
-        
+        try:
+            self.i2c = machine.I2C(0,
+                                  scl=machine.Pin(self.scl_pin),
+                                  sda=machine.Pin(self.sda_pin),
+                                  freq=self.i2c_freq)
+        except (OSError, ValueError):
+            # Requested frequency not supported on this port - fall back
+            # to the universally-safe 400kHz
+            self.i2c_freq = 400000
+            self.i2c = machine.I2C(0,
+                                  scl=machine.Pin(self.scl_pin),
+                                  sda=machine.Pin(self.sda_pin),
+                                  freq=400000)
+
         # Check if sensor is present
         devices = self.i2c.scan()
         if self.i2c_address not in devices:
@@ -29,14 +98,14 @@ class MS5611Sensor:
     
     def _reset(self):
         """Send reset command to MS5611 sensor"""
-        self.i2c.writeto(self.i2c_address, bytearray([0x1E]))  # Send reset command
+        self.i2c.writeto(self.i2c_address, _CMD_RESET)  # Send reset command
         time.sleep_ms(3)  # Wait for reset to complete
-    
+
     def _read_prom(self, addr):
         """Read calibration data from sensor's PROM memory"""
-        # Use readfrom_mem for compatibility with test script
-        data = self.i2c.readfrom_mem(self.i2c_address, addr, 2)
-        return int.from_bytes(data, 'big')  # Convert bytes to integer
+        rx = self._rx2
+        self.i2c.readfrom_mem_into(self.i2c_address, addr, rx)
+        return (rx[0] << 8) | rx[1]  # Convert bytes to integer
     
     def _read_calibration(self):
         """Read and validate sensor calibration data"""
@@ -49,10 +118,18 @@ class MS5611Sensor:
             c5 = self._read_prom(0xAA)  # Reference temperature
             c6 = self._read_prom(0xAC)  # Temperature coefficient of temperature
             
-            # Basic validation - all values should be non-zero
-            calibration = (c1, c2, c3, c4, c5, c6)
-            if all(c > 0 for c in calibration):
-                self.calibration = calibration
+            # Basic validation - all values should be non-zero (PROM
+            # words are unsigned, so truthiness is exactly "> 0"; the
+            # direct test skips the generator the all() version built)
+            if c1 and c2 and c3 and c4 and c5 and c6:
+                self.calibration = (c1, c2, c3, c4, c5, c6)
+                # Pre-shift the power-of-two factors once so the 50 Hz
+                # compensation path skips three multiplies per sample
+                self._c1_shifted = c1 << 15
+                self._c2_shifted = c2 << 16
+                self._c5_shifted = c5 << 8
+                self._c3 = c3
+                self._c4 = c4
                 return True
             else:
                 raise ValueError("Invalid calibration values detected")
@@ -84,38 +161,82 @@ class MS5611Sensor:
         if not self.is_initialized:
             raise RuntimeError("Sensor not initialized")
         
-        c1, c2, c3, c4, c5, c6 = self.calibration
-        
-        # Start pressure conversion with OSR=1024 (fast, good precision)
-        self.i2c.writeto(self.i2c_address, bytearray([0x48]))  # Pressure conversion command (matches test script)
-        time.sleep_ms(10)  # Wait for conversion (10ms as in test script)
-        
-        # Read pressure ADC value
-        d1 = int.from_bytes(self.i2c.readfrom_mem(self.i2c_address, 0x00, 3), 'big')  # Use readfrom_mem
-        
+        # Start pressure conversion at the configured OSR
+        self.i2c.writeto(self.i2c_address, self._cmd_conv_pressure)
+        d1 = self._read_adc_when_ready()
+
         # Start temperature conversion
-        self.i2c.writeto(self.i2c_address, bytearray([0x58]))  # Temperature conversion command (matches test script)
-        time.sleep_ms(10)  # Wait for conversion
-        
-        # Read temperature ADC value
-        d2 = int.from_bytes(self.i2c.readfrom_mem(self.i2c_address, 0x00, 3), 'big')  # Use readfrom_mem
-        
-        # Calculate calibrated pressure using MS5611 formulas
-        dT = d2 - c5 * 256
-        temp = 2000 + dT * c6 // 8388608
-        
-        off = c2 * 65536 + (c4 * dT) // 128
-        sens = c1 * 32768 + (c3 * dT) // 256
-        
-        pressure = (d1 * sens // 2097152 - off) // 32768
+        self.i2c.writeto(self.i2c_address, self._cmd_conv_temp)
+        d2 = self._read_adc_when_ready()
         
+        # Calculate calibrated pressure using MS5611 formulas (native code)
+        pressure = _compensate_pressure(d1, d2, self._c1_shifted, self._c2_shifted,
+                                        self._c3, self._c4, self._c5_shifted)
+
         return pressure / 100.0  # Convert to mbar
-    
+
+    def _read_adc_when_ready(self):
+        """Read the 24-bit ADC result, polling briefly until it is ready.
+
+        The MS5611 returns 0 when read mid-conversion, so sleep the
+        typical conversion time for the configured OSR and then poll in
+        1ms steps instead of always waiting the worst case.
+        """
+        rx = self._rx3
+        time.sleep_ms(self._conv_ms)
+        for _ in range(8):
+            self.i2c.readfrom_mem_into(self.i2c_address, 0x00, rx)
+            value = (rx[0] << 16) | (rx[1] << 8) | rx[2]
+            if value:
+                return value
+            time.sleep_ms(1)
+        return 0  # Conversion never finished - caller sees a zero read
+
+    def start_pressure_conversion(self):
+        """Trigger a pressure conversion without waiting for it.
+
+        The ADC converts on its own (~2.3ms at the default OSR=1024), so
+        calling this at the end of a measurement cycle lets the conversion
+        overlap the idle time until the next tick instead of blocking in
+        read_pressure.
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Sensor not initialized")
+        self.i2c.writeto(self.i2c_address, self._cmd_conv_pressure)
+
+    def read_pressure_pipelined(self):
+        """Read the result of a conversion started by start_pressure_conversion.
+
+        Temperature drifts slowly, so the cached temperature ADC value is
+        reused and only refreshed every 50 cycles (one short blocking read
+        per second at 50 Hz) instead of every sample.
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Sensor not initialized")
+
+        rx = self._rx3
+
+        # Read the pressure ADC value converted during the idle time
+        self.i2c.readfrom_mem_into(self.i2c_address, 0x00, rx)
+        d1 = (rx[0] << 16) | (rx[1] << 8) | rx[2]
+
+        # Refresh the cached temperature reading once per second
+        if self._d2_age == 0 or self._last_d2 == 0:
+            self.i2c.writeto(self.i2c_address, self._cmd_conv_temp)
+            self._last_d2 = self._read_adc_when_ready()
+        self._d2_age = (self._d2_age + 1) % 50
+
+        pressure = _compensate_pressure(d1, self._last_d2, self._c1_shifted,
+                                        self._c2_shifted, self._c3, self._c4,
+                                        self._c5_shifted)
+
+        return pressure / 100.0  # Convert to mbar
+
     def get_info(self):
         """Get sensor information for debugging"""
         if not self.is_initialized:
             return {"status": "not_initialized"}
-        
+
         c1, c2, c3, c4, c5, c6 = self.calibration
         return {
             "status": "initialized",
@@ -126,7 +247,8 @@ class MS5611Sensor:
             "pins": {
                 "scl": self.scl_pin, "sda": self.sda_pin
             },
-            "i2c_address": f"0x{self.i2c_address:02X}"
+            "i2c_address": f"0x{self.i2c_address:02X}",
+            "osr": self.osr
         }
 
 
@@ -160,7 +282,18 @@ class BMI160Sensor:
         
         # Expected chip ID
         self.CHIP_ID_VALUE = 0xD1
-    
+
+        # Preallocated I2C buffers - no allocation per register access
+        self._wbuf = bytearray(1)
+        self._rx1 = bytearray(1)
+        self._rx6 = bytearray(6)
+        self._rx12 = bytearray(12)  # Combined gyro+accel burst read
+
+        # Scale factors for the configured ranges, computed once here
+        # instead of dividing on every read
+        self._accel_scale = 4.0 / 32768.0    # ±4g range, 16-bit resolution
+        self._gyro_scale = 500.0 / 32768.0   # ±500°/s range, 16-bit resolution
+
     def _init_i2c(self):
         """Initialize I2C communication with BMI160 sensor"""
         # Configure I2C bus with specific settings for BMI160
@@ -182,18 +315,21 @@ class BMI160Sensor:
     
     def _read_register(self, reg_addr):
         """Read a single register from BMI160"""
-        data = self.i2c.readfrom_mem(self.i2c_address, reg_addr, 1)
-        return data[0]
-    
+        self.i2c.readfrom_mem_into(self.i2c_address, reg_addr, self._rx1)
+        return self._rx1[0]
+
     def _write_register(self, reg_addr, value):
         """Write a single register to BMI160"""
-        self.i2c.writeto_mem(self.i2c_address, reg_addr, bytearray([value]))
+        self._wbuf[0] = value
+        self.i2c.writeto_mem(self.i2c_address, reg_addr, self._wbuf)
         time.sleep_ms(1)  # Small delay after write
-    
+
     def _read_multiple_registers(self, reg_addr, num_bytes):
-        """Read multiple registers from BMI160"""
-        data = self.i2c.readfrom_mem(self.i2c_address, reg_addr, num_bytes)
-        return data
+        """Read multiple registers from BMI160 (reuses the 6-byte buffer)"""
+        if num_bytes == len(self._rx6):
+            self.i2c.readfrom_mem_into(self.i2c_address, reg_addr, self._rx6)
+            return self._rx6
+        return self.i2c.readfrom_mem(self.i2c_address, reg_addr, num_bytes)
     
     def _soft_reset(self):
         """Perform soft reset of BMI160"""
@@ -252,14 +388,14 @@ class BMI160Sensor:
         
         # Read 6 bytes of accelerometer data
         data = self._read_multiple_registers(self.BMI160_ACCEL_DATA, 6)
+
+        # Convert to signed 16-bit values (no slicing allocations)
+        accel_x = _s16(data[0], data[1])
+        accel_y = _s16(data[2], data[3])
+        accel_z = _s16(data[4], data[5])
         
-        # Convert to signed 16-bit values
-        accel_x = int.from_bytes(data[0:2], 'little', signed=True)
-        accel_y = int.from_bytes(data[2:4], 'little', signed=True)
-        accel_z = int.from_bytes(data[4:6], 'little', signed=True)
-        
-        # Convert to g (±4g range, 16-bit resolution)
-        scale = 4.0 / 32768.0
+        # Convert to g using the precomputed range scale
+        scale = self._accel_scale
         return (accel_x * scale, accel_y * scale, accel_z * scale)
     
     def read_gyro(self):
@@ -269,21 +405,39 @@ class BMI160Sensor:
         
         # Read 6 bytes of gyroscope data
         data = self._read_multiple_registers(self.BMI160_GYRO_DATA, 6)
+
+        # Convert to signed 16-bit values (no slicing allocations)
+        gyro_x = _s16(data[0], data[1])
+        gyro_y = _s16(data[2], data[3])
+        gyro_z = _s16(data[4], data[5])
         
-        # Convert to signed 16-bit values
-        gyro_x = int.from_bytes(data[0:2], 'little', signed=True)
-        gyro_y = int.from_bytes(data[2:4], 'little', signed=True)
-        gyro_z = int.from_bytes(data[4:6], 'little', signed=True)
-        
-        # Convert to °/s (±500°/s range, 16-bit resolution)
-        scale = 500.0 / 32768.0
+        # Convert to °/s using the precomputed range scale
+        scale = self._gyro_scale
         return (gyro_x * scale, gyro_y * scale, gyro_z * scale)
     
     def read_all(self):
-        """Read both accelerometer and gyroscope data"""
-        accel = self.read_accel()
-        gyro = self.read_gyro()
-        return {"accel": accel, "gyro": gyro}
+        """Read both accelerometer and gyroscope data in one I2C burst
+
+        The data registers are contiguous (gyro 0x0C-0x11, accel
+        0x12-0x17), so a single 12-byte read replaces two transactions
+        and halves the bus overhead per IMU sample.
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Sensor not initialized")
+
+        data = self._rx12
+        self.i2c.readfrom_mem_into(self.i2c_address, self.BMI160_GYRO_DATA, data)
+
+        gyro_scale = self._gyro_scale
+        accel_scale = self._accel_scale
+        return {
+            "gyro": (_s16(data[0], data[1]) * gyro_scale,
+                     _s16(data[2], data[3]) * gyro_scale,
+                     _s16(data[4], data[5]) * gyro_scale),
+            "accel": (_s16(data[6], data[7]) * accel_scale,
+                      _s16(data[8], data[9]) * accel_scale,
+                      _s16(data[10], data[11]) * accel_scale),
+        }
     
     def get_info(self):
         """Get sensor information for debugging"""
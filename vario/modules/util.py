@@ -1,16 +1,62 @@
+import micropython
 import urequests
 
-def convert_to_altitude(pressure, base_pressure):
+# Cubic expansion of the barometric formula around the base pressure -
+# the ** transcendental goes through log/exp on the ESP32 soft-float
+# path. Error vs the full formula: <1cm within +-50 hPa, <1m at +-15%
+_ALT_C1 = 8431.045
+_ALT_C2 = 3413.376
+_ALT_C3 = 2059.080
+
+# 1-deep memo: on the ground consecutive samples often quantize to the
+# same hundredth of a mbar, so the previous result can be reused with a
+# single int compare
+_last_alt_key = None
+_last_alt_base = 0.0
+_last_alt = 0.0
+# Reciprocal of the base pressure, refreshed only on recalibration -
+# turns the per-tick divide into a multiply (divides are ~3x slower)
+_inv_base = 0.0
+
+@micropython.native
+def convert_to_altitude(pressure, base_pressure, precise=False):
     """
     Convert pressure in mbar to altitude in meters using the barometric formula.
     Args:
         pressure (float): The current pressure in mbar.
         base_pressure (float): The reference sea-level pressure in mbar.
+        precise (bool): Use the full pow-based formula instead of the
+                        fast polynomial (for ground calibration).
     Returns:
         float: The altitude in meters.
     """
-    # Barometric formula
-    return (1 - (pressure / base_pressure) ** 0.190284) * 145366.45 / 3.28084  # Convert feet to meters
+    global _last_alt_key, _last_alt_base, _last_alt, _inv_base
+
+    if precise:
+        # Full barometric formula
+        return (1 - (pressure / base_pressure) ** 0.190284) * 145366.45 / 3.28084  # Convert feet to meters
+
+    key = int(pressure * 100)
+    if base_pressure != _last_alt_base:
+        # Base changed (recalibration) - refresh the reciprocal and
+        # invalidate the memo
+        _last_alt_base = base_pressure
+        _inv_base = 1.0 / base_pressure
+        _last_alt_key = None
+    elif key == _last_alt_key:
+        return _last_alt
+
+    x = 1.0 - pressure * _inv_base
+    if x > 0.15 or x < -0.15:
+        # Far outside the expansion's accuracy band (>~1.2km from the
+        # base level) - fall back to the exact formula rather than
+        # return a drifting polynomial value
+        return (1 - (pressure / base_pressure) ** 0.190284) * 145366.45 / 3.28084
+    altitude = x * (_ALT_C1 + x * (_ALT_C2 + x * _ALT_C3))
+
+    _last_alt_key = key
+    _last_alt = altitude
+    return altitude
 
 
 def setup_toggle_button(vario_state):
@@ -31,8 +77,14 @@ def setup_toggle_button(vario_state):
     boot_button = Pin(0, Pin.IN, Pin.PULL_UP)  # BOOT button is active-low
     onboard_led = Pin(2, Pin.OUT)  # Onboard LED
 
-    # Debounce timer
-    last_interrupt_time = [0]  # Use list to allow modification in nested function
+    # Debounce state lives on vario_state (attribute store/load instead
+    # of the closure-cell-in-a-list indirection on every interrupt)
+
+    def log_toggle(_):
+        """Deferred out of the IRQ via micropython.schedule - string
+        formatting allocates, which interrupt handlers must not do"""
+        vario_state.log(f"Vario {'started' if vario_state.turned_on else 'stopped'}")
+        vario_state.log(f"Sound {'enabled' if vario_state.sound_enabled else 'disabled'}")
 
     def toggle_main_loop_interrupt(pin):
         """
@@ -41,7 +93,7 @@ def setup_toggle_button(vario_state):
         current_time = time.ticks_ms()
 
         # Debounce: Ignore interrupts that occur within 300ms of the last one
-        if time.ticks_diff(current_time, last_interrupt_time[0]) > 300:
+        if time.ticks_diff(current_time, vario_state.last_button_time) > 300:
             # Toggle main loop state
             vario_state.turned_on = not vario_state.turned_on
 
@@ -51,12 +103,15 @@ def setup_toggle_button(vario_state):
             # Toggle onboard LED state
             onboard_led.value(not onboard_led.value())
 
-            # Log the changes
-            vario_state.log(f"Vario {'started' if vario_state.turned_on else 'stopped'}")
-            vario_state.log(f"Sound {'enabled' if vario_state.sound_enabled else 'disabled'}")
+            # Log from the scheduler, not the IRQ (best effort - the
+            # schedule queue can be full during a log burst)
+            try:
+                micropython.schedule(log_toggle, 0)
+            except RuntimeError:
+                pass
 
             # Update last interrupt time
-            last_interrupt_time[0] = current_time
+            vario_state.last_button_time = current_time
 
     # Attach interrupt to BOOT button (triggers on button press - falling edge)
     boot_button.irq(trigger=Pin.IRQ_FALLING, handler=toggle_main_loop_interrupt)
@@ -65,6 +120,24 @@ def setup_toggle_button(vario_state):
 
     return boot_button, onboard_led
 
+# Reusable frame buffer for send_to_websocket - frames are small, so a
+# pooled 256-byte buffer avoids three allocations per call (same pattern
+# as VarioState._frame_buf)
+_ws_frame_buf = bytearray(256)
+_ws_frame_mv = memoryview(_ws_frame_buf)
+
+# Bound send callable, registered by boot.py once the connection is up.
+# The old path did `import boot` plus an attribute chain on every call -
+# and boot stopped exposing ws_connection at module level long ago
+_ws_send = None
+
+
+def bind_ws(sock):
+    """Register the socket used by send_to_websocket (None to unbind)"""
+    global _ws_send
+    _ws_send = sock.send if sock is not None else None
+
+
 def send_to_websocket(endpoint, message):
     """
     Send a message via the existing WebSocket connection.
@@ -73,34 +146,44 @@ def send_to_websocket(endpoint, message):
         message (str): The message to send.
     """
     try:
-        import boot  # Import boot to access ws_connection
         import urandom as random
-        
-        if boot.ws_connection is None:
+
+        send = _ws_send
+        if send is None:
             return  # No connection available, skip silently
-        
-        # Send the message (simple text frame)
+
+        # Assemble the frame in the pooled buffer (text frame, final fragment)
         message_bytes = message.encode('utf-8')
-        frame = bytearray([0x81])  # Text frame, final fragment
-        
-        if len(message_bytes) < 126:
-            frame.append(0x80 | len(message_bytes))  # Mask bit + length
+        n = len(message_bytes)
+
+        buf = _ws_frame_buf
+        mv = _ws_frame_mv
+        if n + 8 > len(buf):
+            # Rare oversized message - fall back to a one-off buffer
+            buf = bytearray(n + 8)
+            mv = memoryview(buf)
+
+        buf[0] = 0x81
+        if n < 126:
+            buf[1] = 0x80 | n  # Mask bit + length
+            offset = 2
         else:
-            frame.append(0x80 | 126)  # Mask bit + extended length indicator
-            frame.extend(len(message_bytes).to_bytes(2, 'big'))
-        
-        # Add masking key (4 bytes)
-        mask = bytes([random.getrandbits(8) for _ in range(4)])
-        frame.extend(mask)
-        
-        # Mask the payload
-        masked_payload = bytearray()
-        for i, byte in enumerate(message_bytes):
-            masked_payload.append(byte ^ mask[i % 4])
-        
-        frame.extend(masked_payload)
-        boot.ws_connection.send(frame)
-        
+            buf[1] = 0x80 | 126  # Mask bit + extended length indicator
+            buf[2:4] = n.to_bytes(2, 'big')
+            offset = 4
+
+        # Add masking key (4 bytes, drawn in a single PRNG call)
+        mask = random.getrandbits(32).to_bytes(4, 'big')
+        buf[offset:offset + 4] = mask
+        offset += 4
+
+        # Mask the payload in one bulk XOR instead of a per-byte loop
+        repeated_mask = (mask * ((n + 3) // 4))[:n]
+        buf[offset:offset + n] = (
+            (int.from_bytes(message_bytes, 'big') ^ int.from_bytes(repeated_mask, 'big')).to_bytes(n, 'big')
+        )
+        send(mv[:offset + n])
+
     except Exception as e:
         # Silently fail to avoid disrupting the main program
         pass
\ No newline at end of file
@@ -1,3 +1,9 @@
+import struct
+from array import array
+
+from modules.boot_config import FAST_WS_MASK
+
+
 class VarioState:
     def __init__(self, base_pressure, measurement_frequency, integration_interval):
         self.turned_on = False  # Vario state
@@ -6,71 +12,183 @@ class VarioState:
         self.integrated_v_speed = 0.00
         self.last_integrated_v_speed = 0.00
         self.estimated_local_pressure = base_pressure
-        self.altitude_log = [0] * int(integration_interval * measurement_frequency)
+        # Altitude history as a preallocated ring buffer - O(1) writes with
+        # no allocations, instead of list append/pop(0) shifting every sample.
+        # Samples are stored as int centimeters so reads stay unboxed small
+        # ints instead of allocating a float object per access
+        self.altitude_log = array('i', [0] * int(integration_interval * measurement_frequency))
+        self.altitude_index = 0  # Next write position (= oldest sample)
+        # Last two raw samples (int cm) for the median-of-3 glitch filter
+        self.prev_raw_altitude = None
+        self.prev_raw_altitude2 = None
         self.measurement_count = 0
         self.last_measurement_time = 0
+        self.last_display_time = 0  # For rate-limiting display updates
+        self.kalman_filter = None  # Optional KalmanVSpeed, created in main.py
         self.boot_button = None  # GPIO Pin object for BOOT button, initialized in main.py
         self.onboard_led = None  # GPIO Pin object for onboard LED, initialized in main.py
         self.sound_enabled = False  # Sound state, toggled by BOOT button
+        self.log_enabled = True  # Console logging (set False for silent field use)
+        self.last_button_time = 0  # Debounce timestamp for the BOOT button IRQ
         
         # WebSocket logging (initialized in boot.py)
         self.websocket_sock = None
         self.websocket_enabled = False
 
+        # Reusable send buffer - log frames are coalesced here and flushed
+        # in one TCP write instead of one send() per log call
+        self._tx_buf = bytearray(2048)
+        self._tx_mv = memoryview(self._tx_buf)
+        self._tx_len = 0
+        self._last_flush_time = 0
+
+        # Reusable frame-assembly buffer (header + masked payload in place)
+        self._frame_buf = bytearray(512)
+        self._frame_mv = memoryview(self._frame_buf)
+
+        # Bounded log ring drained by a background thread - the measurement
+        # thread only stores the message, framing and sends happen off-path
+        # (size must stay a power of two for the & 63 index masking)
+        self._log_ring = [None] * 64
+        self._log_write = 0
+        self._log_read = 0
+        self._drain_running = False
+
+    def push_altitude(self, altitude):
+        """
+        Store a new altitude sample (int centimeters) in the ring buffer -
+        O(1), no allocation.
+        Returns the advanced write index (which points at the oldest sample).
+        """
+        index = self.altitude_index
+        self.altitude_log[index] = altitude
+        index = (index + 1) % len(self.altitude_log)
+        self.altitude_index = index
+        return index
+
     def log(self, message):
         """
         Enhanced logging method that supports both console and WebSocket
         """
+        # Bail out before formatting when nobody is listening - callers on
+        # the tick path pay nothing for log() lines that go nowhere
+        websocket_active = self.websocket_enabled and self.websocket_sock
+        if not self.log_enabled and not websocket_active:
+            return
+
         import time
-        timestamp = time.ticks_ms()
-        formatted_msg = f"[{timestamp}ms] {message}"
-        
-        # Always print to console
-        print(formatted_msg)
-        
-        # Send to WebSocket if available
-        if self.websocket_enabled and self.websocket_sock:
+        # %-formatting: one C-level pass, cheaper than the f-string's
+        # int-to-str conversion plus string build on MicroPython
+        formatted_msg = "[%dms] %s" % (time.ticks_ms(), message)
+
+        if self.log_enabled:
+            print(formatted_msg)
+
+        # Queue for the WebSocket drain thread if available - no framing or
+        # socket I/O on the caller's (timing-critical) thread
+        if websocket_active:
+            self._log_ring[self._log_write & 63] = formatted_msg
+            self._log_write += 1
+
+    def start_log_drain(self):
+        """Start the background thread that ships queued log messages"""
+        from _thread import start_new_thread
+        if self._drain_running:
+            return
+        self._drain_running = True
+        start_new_thread(self._log_drain_thread, ())
+
+    def _log_drain_thread(self):
+        """Background thread: frame and send queued log messages"""
+        import time
+        while True:
             try:
-                self._send_websocket_frame(formatted_msg)
+                while self._log_read != self._log_write:
+                    message = self._log_ring[self._log_read & 63]
+                    self._log_read += 1
+                    self._send_websocket_frame(message)
+                if self._tx_len and self.websocket_sock:
+                    self.flush_websocket()
             except Exception as e:
                 print(f"WebSocket logging failed: {e}")
                 self.websocket_enabled = False  # Disable on error
+            time.sleep_ms(20)
     
     def _send_websocket_frame(self, message):
-        """Send WebSocket frame (copied from boot.py)"""
+        """Assemble a masked text frame in the reusable buffer and queue it"""
         try:
             message_bytes = message.encode('utf-8')
             message_length = len(message_bytes)
-            
-            # Create frame header
-            frame = bytearray()
-            frame.append(0x81)  # FIN=1, opcode=1 (text)
-            
-            # Add payload length
+
+            buf = self._frame_buf
+            mv = self._frame_mv
+            if message_length + 14 > len(buf):
+                # Rare oversized message - fall back to a one-off buffer
+                buf = bytearray(message_length + 14)
+                mv = memoryview(buf)
+
+            # Pack frame header in place (FIN=1, opcode=1 text, MASK=1)
             if message_length < 126:
-                frame.append(message_length | 0x80)  # MASK=1
+                struct.pack_into('>BB', buf, 0, 0x81, message_length | 0x80)
+                offset = 2
             elif message_length < 65536:
-                frame.append(126 | 0x80)  # MASK=1
-                frame.extend(message_length.to_bytes(2, 'big'))
+                struct.pack_into('>BBH', buf, 0, 0x81, 126 | 0x80, message_length)
+                offset = 4
             else:
-                frame.append(127 | 0x80)  # MASK=1
-                frame.extend(message_length.to_bytes(8, 'big'))
-            
-            # Add masking key
-            mask_key = bytes([0x12, 0x34, 0x56, 0x78])
-            frame.extend(mask_key)
-            
-            # Mask the payload
-            masked_payload = bytearray()
-            for i, byte in enumerate(message_bytes):
-                masked_payload.append(byte ^ mask_key[i % 4])
-            
-            frame.extend(masked_payload)
-            
-            # Send frame
-            self.websocket_sock.send(frame)
+                struct.pack_into('>BBQ', buf, 0, 0x81, 127 | 0x80, message_length)
+                offset = 10
+
+            # Add masking key - with the all-zero key the XOR is the
+            # identity, so the payload is copied straight in and the
+            # masking pass disappears entirely (see FAST_WS_MASK)
+            if FAST_WS_MASK:
+                buf[offset:offset + 4] = b'\x00\x00\x00\x00'
+                offset += 4
+                buf[offset:offset + message_length] = message_bytes
+            else:
+                mask_key = bytes([0x12, 0x34, 0x56, 0x78])
+                buf[offset:offset + 4] = mask_key
+                offset += 4
+
+                # Mask the payload in one bulk XOR instead of a per-byte loop
+                # (the byte-at-a-time version dominated CPU time at 50 Hz logging)
+                repeated_mask = (mask_key * ((message_length + 3) // 4))[:message_length]
+                buf[offset:offset + message_length] = (
+                    int.from_bytes(message_bytes, 'big') ^ int.from_bytes(repeated_mask, 'big')
+                ).to_bytes(message_length, 'big')
+
+            # Queue frame for batched sending
+            self._buffer_frame(mv[:offset + message_length])
             return True
-            
+
         except Exception as e:
             print(f"Error sending WebSocket frame: {e}")
             return False
+
+    def _buffer_frame(self, frame):
+        """Append a frame to the send buffer; flush when full or stale"""
+        import time
+        frame_length = len(frame)
+
+        if self._tx_len + frame_length > len(self._tx_buf):
+            self.flush_websocket()
+
+        if frame_length > len(self._tx_buf):
+            # Frame larger than the buffer - send it directly
+            self.websocket_sock.send(frame)
+            return
+
+        self._tx_buf[self._tx_len:self._tx_len + frame_length] = frame
+        self._tx_len += frame_length
+
+        # Flush at the latest every 100ms so logs stay near real-time
+        if time.ticks_diff(time.ticks_ms(), self._last_flush_time) > 100:
+            self.flush_websocket()
+
+    def flush_websocket(self):
+        """Send all buffered frames in a single TCP write (zero-copy via memoryview)"""
+        import time
+        if self._tx_len:
+            self.websocket_sock.send(self._tx_mv[:self._tx_len])
+            self._tx_len = 0
+        self._last_flush_time = time.ticks_ms()